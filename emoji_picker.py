@@ -5,16 +5,22 @@ Uses GTK with PyGObject for native Linux GUI with dark theme.
 """
 
 import os
+import re
 import sys
 import json
+import pickle
+import tempfile
+import functools
+import itertools
 import subprocess
+import unicodedata
 from pathlib import Path
 
 # GTK imports
 try:
     import gi
     gi.require_version('Gtk', '4.0')
-    from gi.repository import Gtk, Gdk, GLib, Gio
+    from gi.repository import Gtk, Gdk, GLib, Gio, GObject
     GTK_AVAILABLE = True
 except ImportError:
     GTK_AVAILABLE = False
@@ -22,6 +28,157 @@ except ImportError:
     print("Ubuntu/Debian: sudo apt-get install python3-gi python3-gi-cairo gir1.2-gtk-4.0")
     sys.exit(1)
 
+# Optional fuzzy matching for misspelled search words
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Optional fast JSON parser, falling back to the standard library
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data):
+        return json.loads(data.decode('utf-8'))
+    
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Bump when the layout of the pickled emoji list changes
+_EMOJI_CACHE_VERSION = 5
+
+# Number of emojis added to the grid per main loop iteration
+_POPULATE_BATCH_SIZE = 100
+
+def _build_accent_table():
+    """Build a str.translate table mapping accented Latin letters to base letters."""
+    table = {}
+    for code in itertools.chain(range(0xC0, 0x250), range(0x1E00, 0x1F00)):
+        char = base = chr(code)
+        # Follow canonical decompositions down to the base letter (e.g. ǖ -> ü -> u)
+        decomposition = unicodedata.decomposition(base)
+        while decomposition and not decomposition.startswith('<'):
+            base = chr(int(decomposition.split()[0], 16))
+            decomposition = unicodedata.decomposition(base)
+        if base != char:
+            table[char] = base
+    
+    # Drop any stray combining accents
+    for code in range(0x300, 0x370):
+        table[chr(code)] = None
+    return str.maketrans(table)
+
+# Built once so accent stripping is a single C-level str.translate call
+_ACCENTS = _build_accent_table()
+
+# Splits search text into lowercase word tokens (underscores separate slug words)
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Set once the dark theme CSS provider is registered, so re-activation doesn't stack providers
+_dark_theme_applied = False
+
+def apply_dark_theme():
+    """Apply the dark theme to the default display once per process."""
+    global _dark_theme_applied
+    if _dark_theme_applied:
+        return
+    
+    # Create a CSS provider for dark theme
+    css_provider = Gtk.CssProvider()
+    # Apply dark theme CSS
+    css_data = """
+    window {
+        background-color: #2d2d2d;
+        color: #ffffff;
+    }
+    
+    .emoji-button {
+        background-color: #3d3d3d;
+        border: 1px solid #555555;
+        border-radius: 8px;
+        padding: 8px;
+        margin: 2px;
+        font-size: 40px;
+        min-width: 60px;
+        min-height: 60px;
+    }
+    
+    .emoji-button:hover {
+        background-color: #4d4d4d;
+        border-color: #777777;
+    }
+    
+    .emoji-button:active {
+        background-color: #5d5d5d;
+    }
+    
+    .search-entry {
+        background-color: #3d3d3d;
+        border: 1px solid #555555;
+        border-radius: 6px;
+        padding: 8px;
+        color: #ffffff;
+        font-size: 14px;
+    }
+    
+    .search-entry:focus {
+        border-color: #777777;
+    }
+    
+    .status-label {
+        background-color: #3d3d3d;
+        border: 1px solid #555555;
+        border-radius: 6px;
+        padding: 8px;
+        color: #ffffff;
+        font-size: 14px;
+    }
+    
+    notebook {
+        background-color: #2d2d2d;
+    }
+    
+    notebook tab {
+        background-color: #3d3d3d;
+        color: #ffffff;
+        padding: 8px 16px;
+        border-radius: 6px 6px 0 0;
+    }
+    
+    notebook tab:checked {
+        background-color: #4d4d4d;
+    }
+    """
+    css_provider.load_from_data(css_data.encode())
+    
+    # Apply the CSS to every window on the display
+    Gtk.StyleContext.add_provider_for_display(
+        Gdk.Display.get_default(),
+        css_provider,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+    )
+    _dark_theme_applied = True
+
+class EmojiItem(GObject.Object):
+    """List model item describing a single emoji."""
+    __gtype_name__ = "EmojiItem"
+    
+    char = GObject.Property(type=str, default="")
+    name = GObject.Property(type=str, default="")
+    slug = GObject.Property(type=str, default="")
+    group = GObject.Property(type=str, default="")
+    index = GObject.Property(type=int, default=-1)  # Position in the emoji data, -1 if unknown
+    
+    def __init__(self, char, name="", slug="", group="", index=-1):
+        super().__init__(char=char, name=name, slug=slug, group=group, index=index)
+
 class EmojiPickerWindow(Gtk.ApplicationWindow):
     """GTK window for emoji picker."""
     
@@ -31,176 +188,54 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         
         # Add caching for emoji data
         self._emoji_cache = None
-        self._all_emojis_cache = None
-        
-        # Window setup
+        self._emoji_items = None
+        self._items_by_char = None
+        self._trigram_index = None
+        self._token_index = None  # Built on first fuzzy lookup
+        
+        # Emoji fields are stored as parallel lists indexed by emoji position
+        self._chars = None
+        self._names = None
+        self._slugs = None
+        self._groups = None
+        self._search_texts = None
+        
+        # Recent emojis are kept in memory and written back to disk in the background
+        self._recent_cache = None
+        self._recent_flush_id = None
+        # Only one write runs at a time; changes made meanwhile are written after it
+        self._recent_write_in_flight = False
+        self._recent_dirty = False
+        self._close_after_recent_saved = False
+        
+        # Last emoji placed on the GTK clipboard, handed off when the window closes
+        self._clipboard_text = None
+        
+        # Pending live search timeout, replaced on every keystroke
+        self._search_debounce_id = None
+        
+        # Indices of emojis matching the current search, or None to show all
+        self._visible_indices = None
+        
+        # Memoize query results so re-typed or backspaced searches are instant
+        self._match_query = functools.lru_cache(maxsize=256)(self._find_matches)
+        
+        # Window setup - placement is left to the window manager/compositor
         self.set_title("🎨 Emoji Picker")
         self.set_default_size(800, 600)
         self.set_resizable(True)
         self.set_modal(False)  # Allow interaction with other windows
         
-        # Apply dark theme
-        self.apply_dark_theme()
-        
         # Create the UI
         self.setup_ui()
         
         # Connect signals
         self.connect("close-request", self.on_window_close)
         
-        # Try to center the window before showing it
-        self.try_center_window()
-        
         # Focus the window
         self.present()
         self.grab_focus()
     
-    def try_center_window(self):
-        """Try to center the window before it's shown."""
-        try:
-            display = Gdk.Display.get_default()
-            if display:
-                # Get the primary monitor (usually the main display)
-                primary_monitor = display.get_primary_monitor()
-                if primary_monitor:
-                    geometry = primary_monitor.get_geometry()
-                    print(f"Primary monitor geometry: {geometry.x}, {geometry.y}, {geometry.width}x{geometry.height}")
-                    
-                    # Get window size
-                    window_width = 800
-                    window_height = 600
-                    
-                    # Calculate center position
-                    x = geometry.x + (geometry.width - window_width) // 2
-                    y = geometry.y + (geometry.height - window_height) // 2
-                    
-                    print(f"Centering window at: ({x}, {y})")
-                    
-                    # Store the position for later use
-                    self._center_x = x
-                    self._center_y = y
-                    
-                    # Try to set the window position using the surface after the window is shown
-                    GLib.timeout_add(200, self._apply_center_position)
-                    
-                    return
-                
-                print("No primary monitor found, using default position")
-            else:
-                print("Could not get display, using default position")
-        except Exception as e:
-            print(f"Error centering window: {e}, using default position")
-    
-    def _apply_center_position(self):
-        """Apply the center position to the window."""
-        try:
-            if hasattr(self, '_center_x') and hasattr(self, '_center_y'):
-                # Use xdotool to move the window to the center position
-                import subprocess
-                try:
-                    # Wait a bit for the window to be fully shown, then move it
-                    subprocess.run(['xdotool', 'search', '--name', '🎨 Emoji Picker', 'windowmove', str(self._center_x), str(self._center_y)], 
-                                 capture_output=True, timeout=3)
-                    print(f"Successfully moved window to center position ({self._center_x}, {self._center_y})")
-                except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                    print(f"xdotool failed: {e}")
-                except Exception as e:
-                    print(f"Error using xdotool: {e}")
-            else:
-                print("Center position not set")
-        except Exception as e:
-            print(f"Error applying center position: {e}")
-        
-        return False  # Don't repeat
-    
-    def center_window(self, widget=None):
-        """Center the window on screen."""
-        # Use a timeout to center the window after it's fully realized
-        GLib.timeout_add(100, self._do_center_window)
-    
-    def _do_center_window(self):
-        """Actually center the window after it's shown."""
-        # This is now a fallback method
-        print("Fallback centering attempt")
-        return False  # Don't repeat
-    
-    def apply_dark_theme(self):
-        """Apply dark theme to the window."""
-        # Create a CSS provider for dark theme
-        css_provider = Gtk.CssProvider()
-        # Apply dark theme CSS
-        css_data = """
-        window {
-            background-color: #2d2d2d;
-            color: #ffffff;
-        }
-        
-        .emoji-button {
-            background-color: #3d3d3d;
-            border: 1px solid #555555;
-            border-radius: 8px;
-            padding: 8px;
-            margin: 2px;
-            font-size: 40px;
-            min-width: 60px;
-            min-height: 60px;
-        }
-        
-        .emoji-button:hover {
-            background-color: #4d4d4d;
-            border-color: #777777;
-        }
-        
-        .emoji-button:active {
-            background-color: #5d5d5d;
-        }
-        
-        .search-entry {
-            background-color: #3d3d3d;
-            border: 1px solid #555555;
-            border-radius: 6px;
-            padding: 8px;
-            color: #ffffff;
-            font-size: 14px;
-        }
-        
-        .search-entry:focus {
-            border-color: #777777;
-        }
-        
-        .status-label {
-            background-color: #3d3d3d;
-            border: 1px solid #555555;
-            border-radius: 6px;
-            padding: 8px;
-            color: #ffffff;
-            font-size: 14px;
-        }
-        
-        notebook {
-            background-color: #2d2d2d;
-        }
-        
-        notebook tab {
-            background-color: #3d3d3d;
-            color: #ffffff;
-            padding: 8px 16px;
-            border-radius: 6px 6px 0 0;
-        }
-        
-        notebook tab:checked {
-            background-color: #4d4d4d;
-        }
-        """
-        css_provider.load_from_data(css_data.encode())
-        
-        # Apply the CSS to the window
-        Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            css_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
-    
     def setup_ui(self):
         """Set up the user interface."""
         # Main container - use expand to fill available space
@@ -218,10 +253,11 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         search_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         search_label = Gtk.Label(label="🔍 Search:")
         self.search_entry = Gtk.Entry()
-        self.search_entry.set_placeholder_text("Type to search emojis and press Enter...")
+        self.search_entry.set_placeholder_text("Type to search emojis...")
         # Use modern GTK 4 styling approach
         self.search_entry.add_css_class("search-entry")
-        self.search_entry.connect("activate", self.on_search_activated)  # Changed from "changed" to "activate"
+        self.search_entry.connect("activate", self.on_search_activated)
+        self.search_entry.connect("changed", self.on_search_changed)  # Debounced live search
         
         # Search status label for showing results/no results message
         self.search_status_label = Gtk.Label(label="")
@@ -271,11 +307,13 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         recent_container.set_vexpand(True)
         recent_container.set_hexpand(True)
         
-        self.recent_grid = Gtk.Grid()
-        self.recent_grid.set_row_spacing(5)
-        self.recent_grid.set_column_spacing(5)
-        self.recent_grid.set_vexpand(True)  # Make grid expand
-        self.recent_grid.set_hexpand(True)  # Make grid expand horizontally too
+        # Recent emojis are shown in a virtualized grid backed by a list store
+        self.recent_store = Gio.ListStore(item_type=EmojiItem)
+        self.recent_grid = self.create_emoji_grid(self.recent_store)
+        
+        # Placeholder shown when there are no recent emojis yet
+        self.recent_empty_label = Gtk.Label(label="No recent emojis")
+        self.recent_empty_label.set_visible(False)
         
         # Create a scrolled window for recent emojis
         self.recent_scroll = Gtk.ScrolledWindow()
@@ -285,6 +323,7 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         self.recent_scroll.set_min_content_height(400)  # Set minimum height
         self.recent_scroll.set_min_content_width(600)   # Set minimum width
         
+        recent_container.append(self.recent_empty_label)
         recent_container.append(self.recent_scroll)
         self.notebook.append_page(recent_container, recent_label)
         
@@ -296,11 +335,12 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         all_container.set_vexpand(True)
         all_container.set_hexpand(True)
         
-        self.all_grid = Gtk.Grid()
-        self.all_grid.set_row_spacing(5)
-        self.all_grid.set_column_spacing(5)
-        self.all_grid.set_vexpand(True)  # Make grid expand
-        self.all_grid.set_hexpand(True)  # Make grid expand horizontally too
+        # All emojis are shown in a virtualized grid backed by a list store that is
+        # populated once; searches only change which items the filter lets through
+        self.all_store = Gio.ListStore(item_type=EmojiItem)
+        self.all_filter = Gtk.CustomFilter.new(self._all_filter_func)
+        self.all_filter_model = Gtk.FilterListModel(model=self.all_store, filter=self.all_filter)
+        self.all_grid = self.create_emoji_grid(self.all_filter_model)
         
         # Create a scrolled window for all emojis
         self.all_scroll = Gtk.ScrolledWindow()
@@ -328,6 +368,33 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         # Populate emojis
         self.populate_emojis()
     
+    def create_emoji_grid(self, model):
+        """Create a grid view that only realizes buttons for visible emojis."""
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self.on_emoji_item_setup)
+        factory.connect("bind", self.on_emoji_item_bind)
+        
+        # Buttons handle clicks themselves, so no selection is needed
+        grid = Gtk.GridView(model=Gtk.NoSelection(model=model), factory=factory)
+        grid.set_min_columns(9)  # Use 9 columns for better layout
+        grid.set_max_columns(9)
+        grid.set_vexpand(True)  # Make grid expand
+        grid.set_hexpand(True)  # Make grid expand horizontally too
+        return grid
+    
+    def on_emoji_item_setup(self, factory, list_item):
+        """Create the reusable button for a grid cell."""
+        button = Gtk.Button()
+        button.set_size_request(50, 50)
+        button.add_css_class("emoji-button")
+        # Connected once; the handler reads whichever emoji is currently bound
+        button.connect("clicked", self.on_emoji_button_clicked)
+        list_item.set_child(button)
+    
+    def on_emoji_item_bind(self, factory, list_item):
+        """Show the bound emoji on the cell's button."""
+        list_item.get_child().set_label(list_item.get_item().char)
+    
     def populate_emojis(self):
         """Populate the emoji grids."""
         # Populate recent emojis
@@ -338,50 +405,43 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
     
     def populate_recent_emojis(self):
         """Populate the recent emojis grid."""
-        # Clear existing widgets
-        for child in self.recent_grid:
-            self.recent_grid.remove(child)
-        
         # Load recent emojis from file
         recent_emojis = self.load_recent_emojis()
         
-        if not recent_emojis:
-            label = Gtk.Label(label="No recent emojis")
-            self.recent_grid.attach(label, 0, 0, 1, 1)
-            return
+        # Reuse the items of the all emojis grid rather than allocating new ones
+        self.get_all_emojis()
+        items = [
+            self._items_by_char.get(emoji_char) or EmojiItem(emoji_char)
+            for emoji_char in recent_emojis
+        ]
+        self.recent_store.splice(0, self.recent_store.get_n_items(), items)
         
-        # Create emoji buttons - use 9 columns for better layout
-        cols = 9  # Use 9 columns for better layout
-        for i, emoji_char in enumerate(recent_emojis):
-            row = i // cols
-            col = i % cols
-            
-            button = Gtk.Button(label=emoji_char)
-            button.set_size_request(50, 50)
-            button.connect("clicked", self.on_emoji_clicked, emoji_char)
-            button.add_css_class("emoji-button")
-            
-            self.recent_grid.attach(button, col, row, 1, 1)
+        self.recent_empty_label.set_visible(not recent_emojis)
     
     def populate_all_emojis(self):
-        """Populate the all emojis grid."""
-        # Clear existing widgets
-        for child in self.all_grid:
-            self.all_grid.remove(child)
-        
-        # Create emoji buttons - use 9 columns for better layout
-        cols = 9  # Use 9 columns for better layout
-        for i, emoji_data in enumerate(self.get_all_emojis()):
-            row = i // cols
-            col = i % cols
-            
-            emoji_char = emoji_data['char']
-            button = Gtk.Button(label=emoji_char)
-            button.set_size_request(50, 50)
-            button.connect("clicked", self.on_emoji_clicked, emoji_char)
-            button.add_css_class("emoji-button")
-            
-            self.all_grid.attach(button, col, row, 1, 1)
+        """Populate the all emojis grid once, adding items in idle batches."""
+        self.get_all_emojis()
+        items = self._emoji_items
+        
+        # Show the first batch right away so the visible rows appear immediately
+        self.all_store.splice(0, self.all_store.get_n_items(), items[:_POPULATE_BATCH_SIZE])
+        if len(items) > _POPULATE_BATCH_SIZE:
+            GLib.idle_add(self._populate_iter, items, _POPULATE_BATCH_SIZE)
+    
+    def _populate_iter(self, items, index):
+        """Append the next batch of items to the all emojis grid."""
+        batch = items[index:index + _POPULATE_BATCH_SIZE]
+        self.all_store.splice(self.all_store.get_n_items(), 0, batch)
+        
+        index += _POPULATE_BATCH_SIZE
+        if index < len(items):
+            GLib.idle_add(self._populate_iter, items, index)
+        
+        return False  # Don't repeat
+    
+    def on_emoji_button_clicked(self, button):
+        """Handle clicks on any emoji button by reading its label."""
+        self.on_emoji_clicked(button, button.get_label())
     
     def on_emoji_clicked(self, button, emoji_char):
         """Handle emoji button clicks."""
@@ -431,9 +491,27 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
     
     def on_search_activated(self, entry):
         """Handle search when Enter is pressed."""
+        self._cancel_search_debounce()
         search_text = entry.get_text().lower()
         self.filter_emojis(search_text)
     
+    def on_search_changed(self, entry):
+        """Schedule a search once typing pauses for 150ms."""
+        self._cancel_search_debounce()
+        self._search_debounce_id = GLib.timeout_add(150, self._run_search)
+    
+    def _cancel_search_debounce(self):
+        """Cancel a pending live search, if any."""
+        if self._search_debounce_id is not None:
+            GLib.source_remove(self._search_debounce_id)
+            self._search_debounce_id = None
+    
+    def _run_search(self):
+        """Run the debounced live search."""
+        self._search_debounce_id = None
+        self.filter_emojis(self.search_entry.get_text().lower())
+        return False  # Don't repeat
+    
     def on_keyword_added(self, widget):
         """Handle adding a custom keyword to the selected emoji."""
         if not self.selected_emoji:
@@ -461,54 +539,26 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
     
     def filter_emojis(self, search_text):
         """Filter emojis based on search text."""
-        # Clear all emojis grid
-        for child in self.all_grid:
-            self.all_grid.remove(child)
-        
         # Clear search status message
         self.search_status_label.set_text("")
         
-        if not search_text:
-            # Show all emojis
-            self.populate_all_emojis()
+        # Split search text (already lowercased by the caller) into individual words,
+        # ignoring accents so "pinata" and "piñata" both match
+        search_words = search_text.translate(_ACCENTS).split()
+        
+        if not search_words:
+            # Show all emojis (also for whitespace-only queries)
+            self._visible_indices = None
+            self.all_filter.changed(Gtk.FilterChange.LESS_STRICT)
             return
         
-        # Split search text into individual words
-        search_words = search_text.lower().split()
+        # Normalize the query so equivalent searches share a cache entry
+        self.get_all_emojis()
+        self._visible_indices = self._match_query(tuple(sorted(set(search_words))))
         
-        # Filter emojis with whole word matching
-        cols = 9  # Use 9 columns for better layout
-        filtered_count = 0
-        
-        for i, emoji_data in enumerate(self.get_all_emojis()):
-            # Get the searchable text fields
-            name = emoji_data['name'].lower()
-            slug = emoji_data['slug'].lower()
-            group = emoji_data['group'].lower()
-            description = emoji_data.get('description', '').lower()
-            
-            # Check if all search words match in any of the fields
-            matches = True
-            for word in search_words:
-                # Check if the word appears in name, slug, group, or description
-                if (word in name or word in slug or word in group or word in description):
-                    continue
-                else:
-                    matches = False
-                    break
-            
-            if matches:
-                row = filtered_count // cols
-                col = filtered_count % cols
-                
-                emoji_char = emoji_data['char']
-                button = Gtk.Button(label=emoji_char)
-                button.set_size_request(50, 50)
-                button.connect("clicked", self.on_emoji_clicked, emoji_char)
-                button.add_css_class("emoji-button")
-                
-                self.all_grid.attach(button, col, row, 1, 1)
-                filtered_count += 1
+        # The grid stays populated; the filter only hides non-matching emojis
+        self.all_filter.changed(Gtk.FilterChange.DIFFERENT)
+        filtered_count = len(self._visible_indices)
         
         if filtered_count == 0:
             # Show "no results" message next to search field
@@ -517,33 +567,95 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
             # Show count of results
             self.search_status_label.set_text(f"✅ Found {filtered_count} emoji{'s' if filtered_count != 1 else ''}")
     
+    def _all_filter_func(self, item):
+        """Return whether an emoji in the all emojis grid matches the current search."""
+        return self._visible_indices is None or item.index in self._visible_indices
+    
     def on_window_close(self, window):
         """Handle window close event."""
+        # Start a pending recent emojis write now, since the app quits with the window
+        if self._recent_flush_id is not None:
+            GLib.source_remove(self._recent_flush_id)
+            self._flush_recent()
+        
+        if self._recent_write_in_flight:
+            self._close_after_recent_saved = True
+            return True  # Close again once the recent emojis are written
+        
+        # The clipboard contents belong to this process, so hand them off before quitting
+        if self._clipboard_text is not None:
+            clipboard = self.get_display().get_clipboard()
+            if clipboard.is_local():
+                clipboard.store_async(GLib.PRIORITY_DEFAULT, None, self._on_clipboard_stored)
+                return True  # Close again once the clipboard is stored
+            self._clipboard_text = None
+        
         self.close()
         return False  # Allow window to close
     
+    def _on_clipboard_stored(self, clipboard, result):
+        """Finish handing the clipboard to the clipboard manager, then close."""
+        try:
+            clipboard.store_finish(result)
+        except GLib.Error as e:
+            # No clipboard manager (common on plain X11), so let a system command own it
+            print(f"Clipboard store failed: {e.message}")
+            self.hand_off_clipboard_command(self._clipboard_text)
+        
+        self._clipboard_text = None
+        self.close()
+    
     def load_recent_emojis(self):
-        """Load recent emojis from file."""
+        """Load recent emojis, reading the file only on first use."""
+        if self._recent_cache is not None:
+            return self._recent_cache
+        
+        self._recent_cache = self._read_recent_emojis()
+        return self._recent_cache
+    
+    def get_recent_file(self):
+        """Return the path of the recent emojis file."""
         config_dir = Path.home() / ".emoji_picker"
         config_dir.mkdir(exist_ok=True)
-        recent_file = config_dir / "recent_emojis.json"
+        return config_dir / "recent_emojis.json"
+    
+    def _read_recent_emojis(self):
+        """Read recent emojis from file."""
+        recent_file = self.get_recent_file()
         
         if recent_file.exists():
             try:
-                with open(recent_file, 'r') as f:
-                    return json.load(f)
+                return _loads(recent_file.read_bytes())
             except:
                 pass
         return []
     
     def save_recent_emojis(self, recent_emojis):
-        """Save recent emojis to file."""
-        config_dir = Path.home() / ".emoji_picker"
-        config_dir.mkdir(exist_ok=True)
-        recent_file = config_dir / "recent_emojis.json"
+        """Save recent emojis to file atomically in the background."""
+        recent_file = Gio.File.new_for_path(str(self.get_recent_file()))
         
-        with open(recent_file, 'w') as f:
-            json.dump(recent_emojis, f, indent=2)
+        # replace_contents writes a temporary file and renames it over the old one
+        recent_file.replace_contents_bytes_async(
+            GLib.Bytes.new(_dumps(recent_emojis)), None, False, Gio.FileCreateFlags.NONE,
+            None, self._on_recent_saved
+        )
+    
+    def _on_recent_saved(self, recent_file, result):
+        """Finish a background write of the recent emojis file."""
+        try:
+            recent_file.replace_contents_finish(result)
+        except GLib.Error as e:
+            print(f"Error saving recent emojis: {e.message}")
+        self._recent_write_in_flight = False
+        
+        # Write changes made during this write, so the newest list always lands last
+        if self._recent_dirty:
+            self._recent_dirty = False
+            self._flush_recent()
+        
+        if not self._recent_write_in_flight and self._close_after_recent_saved:
+            self._close_after_recent_saved = False
+            self.close()
     
     def add_to_recent(self, emoji_char):
         """Add emoji to recent list."""
@@ -554,22 +666,40 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
         recent_emojis.insert(0, emoji_char)
         
         # No limit on recent emojis - keep all of them
-        self.save_recent_emojis(recent_emojis)
+        # Write to disk off the click path, coalescing rapid clicks into one write
+        if self._recent_flush_id is not None:
+            GLib.source_remove(self._recent_flush_id)
+        self._recent_flush_id = GLib.timeout_add(500, self._flush_recent)
+    
+    def _flush_recent(self):
+        """Write the in-memory recent emojis to disk."""
+        self._recent_flush_id = None
+        if self._recent_write_in_flight:
+            # Writes must not overlap; the completion callback writes again
+            self._recent_dirty = True
+            return False
+        
+        self._recent_write_in_flight = True
+        try:
+            self.save_recent_emojis(self._recent_cache)
+        except Exception as e:
+            self._recent_write_in_flight = False
+            print(f"Error saving recent emojis: {e}")
+        
+        return False  # Don't repeat
     
     def load_emoji_data(self):
-        """Load emoji data from JSON file."""
+        """Load emoji data from JSON file with caching."""
+        # Return cached data if available
+        if self._emoji_cache is not None:
+            return self._emoji_cache
+        
         try:
-            # Try to load from the same directory as the script
-            script_dir = Path(__file__).parent
-            emoji_file = script_dir / "emoji.json"
-            
-            # If not found in script directory, try current working directory
-            if not emoji_file.exists():
-                emoji_file = Path("emoji.json")
+            emoji_file = self.get_emoji_file()
             
             if emoji_file.exists():
-                with open(emoji_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                self._emoji_cache = _loads(emoji_file.read_bytes())
+                return self._emoji_cache
             else:
                 print(f"Error: emoji.json not found at {emoji_file}")
                 return {}
@@ -577,42 +707,178 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
             print(f"Error loading emoji data: {e}")
             return {}
     
+    def get_emoji_file(self):
+        """Return the path of the emoji JSON file."""
+        # Try to load from the same directory as the script
+        script_dir = Path(__file__).parent
+        emoji_file = script_dir / "emoji.json"
+        
+        # If not found in script directory, try current working directory
+        if not emoji_file.exists():
+            emoji_file = Path("emoji.json")
+        return emoji_file
+    
     def get_all_emojis(self):
-        """Get all available emojis from JSON file with caching."""
+        """Load all available emojis from JSON file with caching and return their characters."""
         # Return cached data if available
-        if self._all_emojis_cache is not None:
-            return self._all_emojis_cache
+        if self._chars is not None:
+            return self._chars
+        
+        # The parsed emoji columns are also cached on disk in the user's cache directory
+        emoji_file = self.get_emoji_file()
+        cache_file = Path(GLib.get_user_cache_dir()) / "emoji_picker" / "emoji.cache.pkl"
+        cached = self._load_emoji_pickle(emoji_file, cache_file)
         
+        if cached is not None:
+            columns, trigram_index = cached
+        else:
+            columns = self._build_emoji_columns()
+            trigram_index = self._build_trigram_index(columns[4])
+            if columns[0]:
+                self._save_emoji_pickle(emoji_file, cache_file, columns, trigram_index)
+        
+        # Cache the result along with the list model items for the grids
+        self._chars, self._names, self._slugs, self._groups, self._search_texts = columns
+        self._emoji_items = [
+            EmojiItem(char, name, slug, group, i)
+            for i, (char, name, slug, group)
+            in enumerate(zip(self._chars, self._names, self._slugs, self._groups))
+        ]
+        self._items_by_char = {item.char: item for item in self._emoji_items}
+        self._trigram_index = trigram_index
+        return self._chars
+    
+    def _load_emoji_pickle(self, emoji_file, cache_file):
+        """Load the pickled emoji columns and trigram index if built from the current JSON file."""
+        try:
+            if not (emoji_file.exists() and cache_file.exists()):
+                return None
+            if cache_file.stat().st_mtime < emoji_file.stat().st_mtime:
+                return None
+            
+            with open(cache_file, 'rb') as f:
+                version, source, columns, trigram_index = pickle.load(f)
+            # The JSON file may come from the working directory, so check it's the same one
+            if version != _EMOJI_CACHE_VERSION or source != str(emoji_file.resolve()):
+                return None
+            return columns, trigram_index
+        except Exception as e:
+            print(f"Error loading emoji cache: {e}")
+            return None
+    
+    def _save_emoji_pickle(self, emoji_file, cache_file, columns, trigram_index):
+        """Pickle the emoji columns and trigram index so later launches can skip building them."""
+        temp_path = None
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it, so concurrent launches never
+            # read a partially written cache
+            with tempfile.NamedTemporaryFile('wb', dir=cache_file.parent, delete=False) as f:
+                temp_path = f.name
+                pickle.dump((_EMOJI_CACHE_VERSION, str(emoji_file.resolve()), columns, trigram_index),
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_file)
+        except Exception as e:
+            print(f"Error saving emoji cache: {e}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _build_emoji_columns(self):
+        """Convert the emoji JSON data to parallel lists of chars, names, slugs, groups and search texts."""
+        chars, names, slugs, groups, search_texts = [], [], [], [], []
         emoji_data = self.load_emoji_data()
         
         if not emoji_data:
             print("No emoji data loaded")
-            self._all_emojis_cache = []
-            return []
+            return chars, names, slugs, groups, search_texts
         
-        # Convert JSON data to the expected format
-        emojis = []
         for emoji_char, emoji_info in emoji_data.items():
-            # Create search text from name, slug, group, and description
-            search_text = f"{emoji_info.get('name', '')} {emoji_info.get('slug', '')} {emoji_info.get('group', '')} {emoji_info.get('description', '')}".lower()
+            name = emoji_info.get('name', '')
+            slug = emoji_info.get('slug', '')
+            # Group names repeat hundreds of times, so share a single string per group
+            group = sys.intern(emoji_info.get('group', ''))
+            description = emoji_info.get('description', '')
             
-            emojis.append({
-                'char': emoji_char,
-                'name': emoji_info.get('name', ''),
-                'slug': emoji_info.get('slug', ''),
-                'group': emoji_info.get('group', ''),
-                'description': emoji_info.get('description', ''),
-                'search_text': search_text
-            })
-        
-        # Cache the result
-        self._all_emojis_cache = emojis
-        return emojis
+            # Create lowercase, accent-free search text from name, slug, group, and
+            # description once, so searches never need to normalize emoji fields
+            search_text = f"{name} {slug} {group} {description}".lower().translate(_ACCENTS)
+            
+            chars.append(emoji_char)
+            names.append(name)
+            slugs.append(slug)
+            groups.append(group)
+            search_texts.append(search_text)
+        
+        return chars, names, slugs, groups, search_texts
+    
+    def _find_matches(self, search_words):
+        """Return the set of indices of emojis matching every search word."""
+        # Every word must match the emoji, so intersect the per-word matches
+        return frozenset(set.intersection(
+            *(self._token_lookup(word) for word in search_words)
+        ))
+    
+    def _token_lookup(self, word):
+        """Return indices of emojis matching word, falling back to fuzzy matching."""
+        # Substring matching also finds words inside tokens ("ball" in "basketball")
+        postings = self._substring_lookup(word)
+        if not postings and RAPIDFUZZ_AVAILABLE:
+            postings = self._token_fuzzy_lookup(word)
+        return postings
+    
+    def _build_trigram_index(self, search_texts):
+        """Build an inverted index mapping each 3-character substring to emoji indices."""
+        trigram_index = {}
+        for i, search_text in enumerate(search_texts):
+            for trigram in {search_text[j:j + 3] for j in range(len(search_text) - 2)}:
+                trigram_index.setdefault(trigram, []).append(i)
+        return trigram_index
+    
+    def _substring_lookup(self, word):
+        """Return indices of emojis whose search text contains word."""
+        search_texts = self._search_texts
+        if len(word) < 3:
+            # Too short for the trigram index, scan the search texts directly
+            return {i for i, search_text in enumerate(search_texts) if word in search_text}
+        
+        # Candidates contain every trigram of word; start from the rarest one
+        postings = sorted(
+            (self._trigram_index.get(word[j:j + 3], ()) for j in range(len(word) - 2)),
+            key=len
+        )
+        candidates = set(postings[0]).intersection(*postings[1:])
+        # Trigrams can appear apart from each other, so confirm the whole word
+        return {i for i in candidates if word in search_texts[i]}
+    
+    def _token_fuzzy_lookup(self, word):
+        """Return indices of emojis having a token similar to word (typo tolerance)."""
+        if self._token_index is None:
+            # Only needed for misspelled words, so built on first use
+            token_index = {}
+            for i, search_text in enumerate(self._search_texts):
+                for token in _TOKEN_RE.findall(search_text):
+                    token_index.setdefault(token, set()).add(i)
+            self._token_index = token_index
+        
+        postings = set()
+        for token, score, i in process.extract(word, list(self._token_index), scorer=fuzz.ratio,
+                                               score_cutoff=80, limit=None):
+            postings |= self._token_index[token]
+        return postings
     
     def clear_emoji_cache(self):
         """Clear the emoji cache (useful if JSON file changes)."""
         self._emoji_cache = None
-        self._all_emojis_cache = None
+        self._chars = None
+        self._names = None
+        self._slugs = None
+        self._groups = None
+        self._search_texts = None
+        self._emoji_items = None
+        self._items_by_char = None
+        self._trigram_index = None
+        self._token_index = None
+        self._match_query.cache_clear()
     
     def add_custom_keyword(self, emoji_char, keyword):
         """Add a custom keyword to an emoji's description."""
@@ -644,8 +910,7 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
             script_dir = Path(__file__).parent
             emoji_file = script_dir / "emoji.json"
             
-            with open(emoji_file, 'w', encoding='utf-8') as f:
-                json.dump(emoji_data, f, indent=2, ensure_ascii=False)
+            emoji_file.write_bytes(_dumps(emoji_data))
             
             print(f"Successfully added keyword '{keyword}' to {emoji_char}")
             return True
@@ -655,6 +920,51 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
             return False
     
     def copy_to_clipboard(self, text):
+        """Copy text to clipboard using the GTK display connection."""
+        display = self.get_display()
+        if display is not None:
+            try:
+                if display.get_clipboard().set_content(Gdk.ContentProvider.new_for_value(text)):
+                    # Set the primary selection too so middle-click paste works
+                    display.get_primary_clipboard().set_content(Gdk.ContentProvider.new_for_value(text))
+                    self._clipboard_text = text
+                    return True
+                print("GTK clipboard did not accept the content")
+            except Exception as e:
+                print(f"GTK clipboard failed: {e}")
+        
+        # Fall back to system commands when GTK has no usable display
+        self._clipboard_text = None
+        return self.copy_to_clipboard_command(text)
+    
+    def hand_off_clipboard_command(self, text):
+        """Let a clipboard command keep serving text after the picker exits."""
+        commands = [
+            ['xclip', '-selection', 'clipboard'],
+            ['xsel', '--clipboard', '--input'],
+            ['wl-copy'],
+        ]
+        if os.environ.get('WAYLAND_DISPLAY'):
+            commands.insert(0, commands.pop())  # Prefer wl-copy under Wayland
+        
+        for command in commands:
+            try:
+                # The command forks to serve the clipboard, so don't capture its output;
+                # an inherited pipe would keep run() waiting until the timeout
+                subprocess.run(command,
+                               input=text.encode('utf-8'),
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               timeout=2,
+                               check=True)
+                return True
+            except (subprocess.SubprocessError, OSError) as e:
+                print(f"{command[0]} failed: {e}")
+        
+        print("All clipboard handoff methods failed")
+        return False
+    
+    def copy_to_clipboard_command(self, text):
         """Copy text to clipboard using system commands."""
         # Set DISPLAY environment variable if not set
         env = os.environ.copy()
@@ -718,22 +1028,19 @@ class EmojiPickerWindow(Gtk.ApplicationWindow):
     
     def show_notification(self, message):
         """Show a notification message."""
-        # Use a timeout to show notification asynchronously
-        GLib.timeout_add(50, self._show_notification_async, message)
-    
-    def _show_notification_async(self, message):
-        """Show notification asynchronously."""
-        try:
-            # Try to use notify-send if available with timeout
-            subprocess.run(['notify-send', 'Emoji Picker', message], 
-                         capture_output=True, timeout=0.5)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # Fallback to print
+        app = self.get_application()
+        if app is None:
             print(f"Notification: {message}")
+            return
+        
+        try:
+            # Sent over the application's existing D-Bus connection
+            notification = Gio.Notification.new("Emoji Picker")
+            notification.set_body(message)
+            notification.set_icon(Gio.ThemedIcon.new("face-smile"))
+            app.send_notification("emoji-copied", notification)
         except Exception as e:
             print(f"Notification error: {e}")
-        
-        return False  # Don't repeat
 
 def main():
     """Main function."""
@@ -747,6 +1054,9 @@ def main():
         app = Gtk.Application(application_id="com.emoji.picker")
         
         def on_activate(app):
+            # Apply dark theme
+            apply_dark_theme()
+            
             # Create and show the picker window
             window = EmojiPickerWindow(app)
             window.connect("close-request", lambda w: app.quit())
@@ -119,7 +119,7 @@ show_usage() {
     echo ""
     echo "📋 Features:"
     echo "   - Native GTK GUI with dark theme"
-    echo "   - Search emojis by typing and pressing Enter"
+    echo "   - Search emojis as you type"
     echo "   - Recent emojis tab"
     echo "   - Automatic clipboard copying"
     echo ""